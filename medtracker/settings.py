@@ -1,4 +1,6 @@
 import os
+import sys
+import orjson
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -64,6 +66,33 @@ DATABASES = {
     }
 }
 
+MEMCACHED_LOCATION = os.getenv("MEMCACHED_LOCATION")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache"
+        if MEMCACHED_LOCATION
+        else "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": MEMCACHED_LOCATION or "medtracker",
+    }
+}
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "drf_orjson_renderer.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # Match DRF's own encoder: UTC datetimes with a "Z" suffix, and
+    # non-string keys (e.g. the indexes of list validation errors) allowed.
+    "ORJSON_RENDERER_OPTIONS": (orjson.OPT_UTC_Z, orjson.OPT_NON_STR_KEYS),
+}
+
+# Cached API responses are invalidated through version counters stored in
+# the cache itself, which is only safe when every worker shares one cache.
+# A per-process LocMemCache would keep serving stale responses from the
+# workers that did not handle the write.
+CACHE_API_RESPONSES = bool(MEMCACHED_LOCATION)
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
 USE_I18N = True
@@ -71,3 +100,22 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+
+if TESTING:
+    # Hashing strength is irrelevant for throwaway test users.
+    PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+    # The test runner's workers each use their own databases, so the
+    # per-process cache is consistent with them.
+    CACHE_API_RESPONSES = True
+
+    # Local test runs use an in-memory database; CI keeps testing on PostgreSQL.
+    if not os.getenv("CI"):
+        DATABASES["default"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        }
+        # SQLite builds covering indexes as plain indexes, which is fine here.
+        SILENCED_SYSTEM_CHECKS = ["models.W040"]
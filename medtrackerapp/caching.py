@@ -0,0 +1,60 @@
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+LIST_CACHE_TIMEOUT = 60 * 5
+EXPECTED_DOSES_CACHE_TIMEOUT = 60 * 60
+
+
+def response_cache_enabled() -> bool:
+    """
+    Return whether API responses may be cached.
+
+    See `CACHE_API_RESPONSES` in the settings: invalidation only reaches
+    every worker when the cache backend is shared between them.
+    """
+    return settings.CACHE_API_RESPONSES
+
+
+def cache_version(group: str) -> int:
+    """
+    Return the current version of a group of cached entries.
+
+    Keys built with `versioned_key` embed this version, so calling
+    `bump_cache_version` makes every entry of the group unreachable at
+    once without knowing (or scanning for) the individual keys. Stale
+    entries simply expire.
+    """
+    # Seeding from the clock means a version that was evicted and
+    # recreated can never collide with one used before.
+    return cache.get_or_set(f"version:{group}", time.time_ns, None)
+
+
+def bump_cache_version(group: str) -> None:
+    """
+    Invalidate every cache entry built for the given group.
+
+    The bump is deferred until the current transaction commits (or runs
+    immediately outside one). Bumping earlier would let a concurrent
+    request cache the not-yet-replaced rows under the new version, where
+    they would be served until they expire.
+    """
+    transaction.on_commit(partial(_incr_version, group))
+
+
+def _incr_version(group: str) -> None:
+    key = f"version:{group}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def versioned_key(group: str, *parts) -> str:
+    """Build a cache key for `group` at its current version."""
+    digest = hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()
+    return f"{group}:{cache_version(group)}:{digest}"
@@ -0,0 +1,28 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from rest_framework.filters import SearchFilter
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    SearchFilter that ranks its matches by trigram similarity on PostgreSQL.
+
+    Matching is unchanged: the `icontains` lookups of `SearchFilter`, which
+    the `med_name_upper_trgm` index (migration 0003) serves on PostgreSQL.
+    The matches are then ordered by `pg_trgm` similarity between the search
+    terms and the first search field, closest first. Other backends, which
+    lack `pg_trgm`, get plain `SearchFilter` results.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        terms = self.get_search_terms(request)
+        search_fields = self.get_search_fields(view, request)
+        if not terms or not search_fields:
+            return queryset
+        if connections[queryset.db].vendor != "postgresql":
+            return queryset
+
+        field = search_fields[0].lstrip("".join(self.lookup_prefixes))
+        similarity = TrigramSimilarity(field, " ".join(terms))
+        return queryset.annotate(search_rank=similarity).order_by("-search_rank", "pk")
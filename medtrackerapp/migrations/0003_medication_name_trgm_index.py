@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# Django compiles `name__icontains` on PostgreSQL to
+# `UPPER("name"::text) LIKE UPPER('%term%')`; a trigram GIN index on that
+# exact expression lets the note search use an index instead of a seq scan.
+INDEX_NAME = "med_name_upper_trgm"
+
+
+def create_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON medtrackerapp_medication "
+        "USING gin (UPPER(name::text) gin_trgm_ops)"
+    )
+
+
+def drop_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("medtrackerapp", "0002_note"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_name_trigram_index, drop_name_trigram_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-15 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("medtrackerapp", "0003_medication_name_trgm_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="doselog",
+            name="taken_at",
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-15 21:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("medtrackerapp", "0004_doselog_taken_at_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="doselog",
+            name="medication",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="medtrackerapp.medication",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="doselog",
+            index=models.Index(
+                fields=["medication", "taken_at"], name="dlog_med_taken_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("medtrackerapp", "0005_doselog_medication_taken_at_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="doselog",
+            name="taken_at",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="doselog",
+            index=models.Index(
+                fields=["taken_at"],
+                include=("id", "medication", "was_taken"),
+                name="dlog_taken_cov",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("medtrackerapp", "0006_doselog_taken_at_covering_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="doselog",
+            name="dlog_taken_cov",
+        ),
+        migrations.AddField(
+            model_name="doselog",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="doselog",
+            index=models.Index(
+                fields=["taken_at"],
+                include=("id", "medication", "was_taken", "updated_at"),
+                name="dlog_taken_cov",
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
-from datetime import date as _date
+from django.db.models import Count, Q
+from datetime import date as _date, datetime, time, timedelta
 from django.utils import timezone
 from .services import DrugInfoService
 
@@ -29,14 +30,24 @@ class Medication(models.Model):
         The adherence rate is the percentage of all recorded doses that
         were marked as taken. Rounded to two decimals.
 
+        If the instance was loaded with `total_doses` and `taken_doses`
+        annotations (see `MedicationViewSet.get_queryset`), those counts
+        are used instead of querying the dose logs.
+
         Returns:
             float: Adherence percentage between 0.0 and 100.0.
         """
-        logs = self.doselog_set.all()
-        if not logs.exists():
+        if hasattr(self, "total_doses") and hasattr(self, "taken_doses"):
+            total, taken = self.total_doses, self.taken_doses
+        else:
+            counts = self.doselog_set.aggregate(
+                total=Count("id"), taken=Count("id", filter=Q(was_taken=True))
+            )
+            total, taken = counts["total"], counts["taken"]
+
+        if not total:
             return 0.0
-        taken = logs.filter(was_taken=True).count()
-        return round((taken / logs.count()) * 100, 2)
+        return round((taken / total) * 100, 2)
 
     def expected_doses(self, days: int) -> int:
         """
@@ -77,9 +88,7 @@ class Medication(models.Model):
         if start_date > end_date:
             raise ValueError("start_date must be before or equal to end_date")
 
-        logs = self.doselog_set.filter(
-            taken_at__date__gte=start_date, taken_at__date__lte=end_date
-        )
+        logs = self.doselog_set.taken_between(start_date, end_date)
         days = (end_date - start_date).days + 1
         expected = self.expected_doses(days)
 
@@ -106,6 +115,42 @@ class Medication(models.Model):
         except Exception as exc:
             return {"error": str(exc)}
 
+    def external_info_etag(self):
+        """
+        Return the ETag of the cached external drug information.
+
+        Returns:
+            str | None: The ETag, or None if no information is cached
+                  for this medication's name yet.
+        """
+        return DrugInfoService.get_etag(self.name)
+
+
+class DoseLogQuerySet(models.QuerySet):
+    """Custom queryset for DoseLog with date-range helpers."""
+
+    def taken_between(self, start_date: _date, end_date: _date):
+        """
+        Filter logs taken between two dates (inclusive).
+
+        Dates are interpreted in the current timezone. The range is
+        expressed as `start <= taken_at < end + 1 day` on the raw column
+        rather than via `taken_at__date`, so the database can use the
+        index on `taken_at` instead of evaluating a date cast per row.
+
+        Args:
+            start_date (date): First day of the range.
+            end_date (date): Last day of the range.
+
+        Returns:
+            QuerySet: The filtered dose logs.
+        """
+        start = timezone.make_aware(datetime.combine(start_date, time.min))
+        end = timezone.make_aware(
+            datetime.combine(end_date + timedelta(days=1), time.min)
+        )
+        return self.filter(taken_at__gte=start, taken_at__lt=end)
+
 
 class DoseLog(models.Model):
     """
@@ -115,14 +160,33 @@ class DoseLog(models.Model):
     medication was either taken or missed.
     """
 
-    medication = models.ForeignKey(Medication, on_delete=models.CASCADE)
+    # Indexed as the leading column of dlog_med_taken_idx instead.
+    medication = models.ForeignKey(Medication, on_delete=models.CASCADE, db_index=False)
     taken_at = models.DateTimeField()
     was_taken = models.BooleanField(default=True)
+    # Lets the date range ETag notice edits to any log, not just new ones.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = DoseLogQuerySet.as_manager()
 
     class Meta:
         """Metadata options for the DoseLog model."""
 
         ordering = ["-taken_at"]
+        indexes = [
+            # Serves per-medication lookups such as adherence over a
+            # period as a bounded range scan, already sorted by time.
+            models.Index(fields=["medication", "taken_at"], name="dlog_med_taken_idx"),
+            # Date range filters, their ETag aggregate and cursor
+            # pagination scan taken_at and read only these columns, so
+            # PostgreSQL can answer them from the index alone. Backends
+            # without covering indexes get a plain index.
+            models.Index(
+                fields=["taken_at"],
+                include=["id", "medication", "was_taken", "updated_at"],
+                name="dlog_taken_cov",
+            ),
+        ]
 
     def __str__(self):
         """Return a human-readable description of the dose event."""
@@ -0,0 +1,19 @@
+from rest_framework.pagination import CursorPagination
+
+
+class DoseLogCursorPagination(CursorPagination):
+    """
+    Keyset pagination for dose logs in chronological order.
+
+    Pagination is opt-in: it only applies when the client sends a
+    `page_size` query parameter, so existing callers keep receiving a
+    plain list. Cursors seek on the indexed `taken_at` column instead
+    of using OFFSET, so every page costs the same however deep it is.
+    `id` breaks ties between logs sharing a timestamp (common after a
+    bulk sync), so such logs are never skipped or repeated across pages.
+    """
+
+    ordering = ("taken_at", "id")
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 500
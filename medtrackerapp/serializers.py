@@ -13,12 +13,33 @@ class MedicationSerializer(serializers.ModelSerializer):
     def get_adherence(self, obj):
         return obj.adherence_rate()
 
+    def to_representation(self, instance):
+        # Same fast path as DoseLogSerializer: the field list is fixed, so
+        # read the attributes directly.
+        return {
+            "id": instance.id,
+            "name": instance.name,
+            "dosage_mg": instance.dosage_mg,
+            "prescribed_per_day": instance.prescribed_per_day,
+            "adherence": self.get_adherence(instance),
+        }
+
 
 class DoseLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = DoseLog
         fields = ["id", "medication", "taken_at", "was_taken"]
 
+    def to_representation(self, instance):
+        # Dose logs are listed in bulk, so read the columns directly instead
+        # of resolving every field through the generic serializer machinery.
+        return {
+            "id": instance.id,
+            "medication": instance.medication_id,
+            "taken_at": self.fields["taken_at"].to_representation(instance.taken_at),
+            "was_taken": instance.was_taken,
+        }
+
 
 class NoteSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,4 +1,13 @@
+import hashlib
+import json
+
 import requests
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+# Shared across lookups so the pooled keep-alive connection to OpenFDA
+# is reused instead of paying a new TCP + TLS handshake per request.
+_session = requests.Session()
 
 
 class DrugInfoService:
@@ -14,6 +23,7 @@ class DrugInfoService:
     """
 
     BASE_URL = "https://api.fda.gov/drug/label.json"
+    CACHE_TIMEOUT = 60 * 60
 
     @classmethod
     def get_drug_info(cls, drug_name: str):
@@ -22,7 +32,10 @@ class DrugInfoService:
 
         This method queries the OpenFDA "drug/label" endpoint for
         a specific generic drug name and returns a simplified
-        dictionary of relevant information.
+        dictionary of relevant information. Successful lookups are
+        cached per (case-insensitive) drug name for `CACHE_TIMEOUT`
+        seconds, together with an ETag of the result (see `get_etag`);
+        errors are never cached.
 
         Args:
             drug_name (str): The name of the medication to search for.
@@ -58,9 +71,39 @@ class DrugInfoService:
         if not drug_name:
             raise ValueError("drug_name is required")
 
+        key = cls._cache_key(drug_name)
+        data = cache.get(key)
+        if data is None:
+            data = cls._fetch_drug_info(drug_name)
+            body = json.dumps(data, sort_keys=True).encode()
+            etag = quote_etag(hashlib.sha256(body).hexdigest())
+            cache.set_many({key: data, f"{key}:etag": etag}, cls.CACHE_TIMEOUT)
+        return data
+
+    @classmethod
+    def get_etag(cls, drug_name: str):
+        """
+        Return the ETag of the cached information for `drug_name`.
+
+        Only the small tag is read, so a conditional request can be
+        answered without loading, fetching or hashing the drug info.
+        Returns None if nothing is cached for the name.
+        """
+        if not drug_name:
+            return None
+        return cache.get(f"{cls._cache_key(drug_name)}:etag")
+
+    @staticmethod
+    def _cache_key(drug_name: str):
+        digest = hashlib.sha256(drug_name.lower().encode()).hexdigest()
+        return f"druginfo:{digest}"
+
+    @classmethod
+    def _fetch_drug_info(cls, drug_name: str):
+        """Query OpenFDA for `drug_name` and simplify the first result."""
         params = {"search": f"openfda.generic_name:{drug_name.lower()}", "limit": 1}
 
-        resp = requests.get(cls.BASE_URL, params=params, timeout=10)
+        resp = _session.get(cls.BASE_URL, params=params, timeout=10)
         if resp.status_code != 200:
             raise ValueError(f"OpenFDA API error: {resp.status_code}")
 
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import bump_cache_version
+from .models import DoseLog, Medication, Note
+
+
+@receiver([post_save, post_delete], sender=Medication)
+def invalidate_medication_caches(sender, **kwargs):
+    """Medication changes affect medication lists, expected doses and note searches."""
+    bump_cache_version("medications")
+    bump_cache_version("expected-doses")
+    bump_cache_version("notes")
+
+
+@receiver([post_save, post_delete], sender=DoseLog)
+def invalidate_adherence_caches(sender, **kwargs):
+    """Dose logs feed the `adherence` field of cached medication lists."""
+    bump_cache_version("medications")
+
+
+@receiver([post_save, post_delete], sender=Note)
+def invalidate_note_caches(sender, **kwargs):
+    """Note changes affect cached note lists."""
+    bump_cache_version("notes")
@@ -0,0 +1,36 @@
+import factory
+from django.utils import timezone
+
+from medtrackerapp.models import DoseLog, Medication, Note
+
+
+class MedicationFactory(factory.django.DjangoModelFactory):
+    """Builds Medication instances with a unique name per instance."""
+
+    class Meta:
+        model = Medication
+
+    name = factory.Sequence(lambda n: f"Drug{n}")
+    dosage_mg = 100
+    prescribed_per_day = 2
+
+
+class DoseLogFactory(factory.django.DjangoModelFactory):
+    """Builds DoseLog entries for a freshly created medication by default."""
+
+    class Meta:
+        model = DoseLog
+
+    medication = factory.SubFactory(MedicationFactory)
+    taken_at = factory.LazyFunction(timezone.now)
+    was_taken = True
+
+
+class NoteFactory(factory.django.DjangoModelFactory):
+    """Builds Note entries for a freshly created medication by default."""
+
+    class Meta:
+        model = Note
+
+    medication = factory.SubFactory(MedicationFactory)
+    text = factory.Sequence(lambda n: f"Note {n}")
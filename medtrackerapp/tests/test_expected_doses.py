@@ -1,33 +1,46 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from medtrackerapp.models import Medication
+from medtrackerapp.tests.factories import DoseLogFactory, MedicationFactory
 
 
 class MedicationExpectedDosesTests(APITestCase):
     """Tests for GET /api/medications/<id>/expected-doses/?days=X"""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.med = MedicationFactory(name="Aspirin")
+        cls.base_url = reverse("medication-expected-doses-view", args=[cls.med.id])
+
     def setUp(self):
-        self.med = Medication.objects.create(
-            name="Aspirin", dosage_mg=100, prescribed_per_day=2
-        )
-        self.url = (
-            lambda days: reverse("medication-expected-doses-view", args=[self.med.id])
-            + f"?days={days}"
-        )
+        cache.clear()
+
+    def url(self, days):
+        return f"{self.base_url}?days={days}"
 
     def test_expected_doses_valid(self):
         """Valid days parameter returns correct expected doses"""
-        response = self.client.get(self.url(5))
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url(5))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["medication_id"], self.med.id)
         self.assertEqual(response.data["days"], 5)
         self.assertEqual(response.data["expected_doses"], 10)
 
+    def test_expected_doses_reads_only_needed_columns(self):
+        """The medication is loaded without the columns the view ignores"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url(5))
+        self.assertNotIn("dosage_mg", queries[0]["sql"])
+        self.assertIn("prescribed_per_day", queries[0]["sql"])
+
     def test_missing_days_param(self):
         """Missing days parameter returns 400"""
-        url = reverse("medication-expected-doses-view", args=[self.med.id])
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_invalid_days_param(self):
@@ -36,6 +49,8 @@ class MedicationExpectedDosesTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         response = self.client.get(self.url("abc"))
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url("9" * 5000))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_value_error_from_model(self):
         """If model raises ValueError, API returns 400"""
@@ -43,3 +58,71 @@ class MedicationExpectedDosesTests(APITestCase):
         self.med.save()
         response = self.client.get(self.url(5))
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expected_doses_served_from_cache(self):
+        """A repeated request is answered from the cache without queries"""
+        self.client.get(self.url(5))
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url(5))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["expected_doses"], 10)
+
+    @override_settings(CACHE_API_RESPONSES=False)
+    def test_expected_doses_not_cached_without_shared_cache(self):
+        """Without a shared cache backend every request reads the schedule"""
+        self.client.get(self.url(5))
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url(5))
+        self.assertEqual(response.data["expected_doses"], 10)
+
+    def test_dose_logs_do_not_invalidate_cache(self):
+        """Logging a dose keeps the cached result, which it cannot change"""
+        self.client.get(self.url(5))
+        with self.captureOnCommitCallbacks(execute=True):
+            DoseLogFactory(medication=self.med)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url(5))
+        self.assertEqual(response.data["expected_doses"], 10)
+
+    def test_schedule_change_invalidates_cache(self):
+        """Changing the schedule is reflected on the next request"""
+        self.client.get(self.url(5))
+        self.med.prescribed_per_day = 3
+        with self.captureOnCommitCallbacks(execute=True):
+            self.med.save()
+        response = self.client.get(self.url(5))
+        self.assertEqual(response.data["expected_doses"], 15)
+
+    def test_missing_medication_not_cached(self):
+        """A deleted medication returns 404 rather than a cached result"""
+        self.client.get(self.url(5))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.med.delete()
+        response = self.client.get(self.url(5))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class MedicationExpectedDosesBulkTests(APITestCase):
+    """Tests for GET /api/medications/expected-doses-bulk/?days=X"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.meds = MedicationFactory.create_batch(3)
+        cls.no_schedule = MedicationFactory(prescribed_per_day=0)
+        cls.base_url = reverse("medication-expected-doses-bulk")
+
+    def test_expected_doses_for_all_medications(self):
+        """All medications are computed in a single query"""
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{self.base_url}?days=7")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["days"], 7)
+        expected = [{"medication_id": m.id, "expected_doses": 14} for m in self.meds]
+        expected.append({"medication_id": self.no_schedule.id, "expected_doses": None})
+        self.assertEqual(response.data["results"], expected)
+
+    def test_invalid_days_param(self):
+        """Missing, non-integer or non-positive days parameter returns 400"""
+        for query in ("", "?days=abc", "?days=0", "?days=-1", "?days=1e3", "?days=²"):
+            response = self.client.get(f"{self.base_url}{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
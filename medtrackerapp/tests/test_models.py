@@ -1,88 +1,55 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from medtrackerapp.models import Medication, DoseLog
+from medtrackerapp.tests.factories import DoseLogFactory, MedicationFactory
 from django.utils import timezone
-from datetime import date, timedelta
-from django.db import IntegrityError
+from datetime import date, datetime, time, timedelta
+from django.db import IntegrityError, transaction
 from unittest.mock import patch
 
 
 class MedicationModelTests(TestCase):
     """Tests for Medication model covering positive and negative paths."""
 
-    def setUp(self):
-        """Set up a base medication for generic tests."""
-        self.base_med = Medication.objects.create(
-            name="Aspirin", dosage_mg=100, prescribed_per_day=2
-        )
-
-    def test_str_returns_name_and_dosage(self):
-        """__str__ returns formatted string with name and dosage."""
-        self.assertEqual(str(self.base_med), "Aspirin (100mg)")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a base medication shared by every test in the class."""
+        cls.base_med = MedicationFactory(name="Aspirin")
 
     def test_adherence_rate_all_doses_taken(self):
         """adherence_rate returns 100.0 when all doses are taken."""
         now = timezone.now()
-        DoseLog.objects.create(
-            medication=self.base_med, taken_at=now - timedelta(hours=30)
-        )
-        DoseLog.objects.create(
-            medication=self.base_med, taken_at=now - timedelta(hours=1)
-        )
+        DoseLogFactory(medication=self.base_med, taken_at=now - timedelta(hours=30))
+        DoseLogFactory(medication=self.base_med, taken_at=now - timedelta(hours=1))
 
         adherence = self.base_med.adherence_rate()
         self.assertEqual(adherence, 100.0)
 
-    # expected_doses()
+    def test_adherence_rate_no_logs(self):
+        """adherence_rate returns 0.0 when no doses were logged."""
+        self.assertEqual(self.base_med.adherence_rate(), 0.0)
 
-    def test_expected_doses_positive(self):
-        """expected_doses returns correct multiplication for normal input."""
-        med = Medication.objects.create(
-            name="Ibuprofen", dosage_mg=200, prescribed_per_day=3
-        )
-        self.assertEqual(med.expected_doses(5), 15)
+    def test_adherence_rate_is_single_query(self):
+        """adherence_rate counts taken and total doses in one query."""
+        DoseLogFactory(medication=self.base_med, was_taken=True)
+        DoseLogFactory(medication=self.base_med, was_taken=False)
 
-    def test_expected_doses_zero_days(self):
-        """Zero days should return 0 expected doses."""
-        self.assertEqual(self.base_med.expected_doses(0), 0)
-
-    def test_expected_doses_negative_days_raises(self):
-        """Negative day input must raise ValueError."""
-        with self.assertRaises(ValueError):
-            self.base_med.expected_doses(-1)
-
-    def test_expected_doses_invalid_schedule_raises(self):
-        """prescribed_per_day <= 0 must raise ValueError."""
-        med = Medication.objects.create(
-            name="Ibuprofen", dosage_mg=200, prescribed_per_day=0
-        )
-        with self.assertRaises(ValueError):
-            med.expected_doses(3)
+        with self.assertNumQueries(1):
+            adherence = self.base_med.adherence_rate()
+        self.assertEqual(adherence, 50.0)
 
     # adherence_rate_over_period()
 
     def test_adherence_rate_over_period_valid(self):
         """Correctly calculates adherence rate in a date range."""
-        today = date.today()
-        times = [
-            timezone.make_aware(
-                timezone.datetime(today.year, today.month, today.day, 8)
-            ),
-            timezone.make_aware(
-                timezone.datetime(today.year, today.month, today.day - 1, 8)
-            ),
-            timezone.make_aware(
-                timezone.datetime(today.year, today.month, today.day - 2, 8)
-            ),
-        ]
-
-        DoseLog.objects.create(
-            medication=self.base_med, taken_at=times[0], was_taken=True
-        )
-        DoseLog.objects.create(
-            medication=self.base_med, taken_at=times[1], was_taken=False
-        )
-        DoseLog.objects.create(
-            medication=self.base_med, taken_at=times[2], was_taken=True
+        anchor = timezone.localtime().replace(hour=8, minute=0, second=0, microsecond=0)
+        today = anchor.date()
+        times = [anchor - timedelta(days=k) for k in (0, 1, 2)]
+
+        DoseLog.objects.bulk_create(
+            [
+                DoseLog(medication=self.base_med, taken_at=t, was_taken=w)
+                for t, w in zip(times, [True, False, True])
+            ]
         )
 
         rate = self.base_med.adherence_rate_over_period(
@@ -120,14 +87,50 @@ class MedicationModelTests(TestCase):
             self.assertEqual(rate, 0.0)
 
 
-class MedicationExternalInfoTests(TestCase):
-    """Tests for fetch_external_info method with success and failure paths."""
+class MedicationComputationTests(SimpleTestCase):
+    """Tests for Medication methods that never touch the database."""
 
     def setUp(self):
-        """Set up a base medication for generic tests."""
-        self.base_med = Medication.objects.create(
-            name="Aspirin", dosage_mg=100, prescribed_per_day=2
+        """Build an unsaved medication; SimpleTestCase rejects any query."""
+        self.base_med = MedicationFactory.build(name="Aspirin")
+
+    def test_str_returns_name_and_dosage(self):
+        """__str__ returns formatted string with name and dosage."""
+        self.assertEqual(str(self.base_med), "Aspirin (100mg)")
+
+    # expected_doses()
+
+    def test_expected_doses_positive(self):
+        """expected_doses returns correct multiplication for normal input."""
+        med = MedicationFactory.build(
+            name="Ibuprofen", dosage_mg=200, prescribed_per_day=3
         )
+        self.assertEqual(med.expected_doses(5), 15)
+
+    def test_expected_doses_zero_days(self):
+        """Zero days should return 0 expected doses."""
+        self.assertEqual(self.base_med.expected_doses(0), 0)
+
+    def test_expected_doses_negative_days_raises(self):
+        """Negative day input must raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.base_med.expected_doses(-1)
+
+    def test_expected_doses_invalid_schedule_raises(self):
+        """prescribed_per_day <= 0 must raise ValueError."""
+        med = MedicationFactory.build(
+            name="Ibuprofen", dosage_mg=200, prescribed_per_day=0
+        )
+        with self.assertRaises(ValueError):
+            med.expected_doses(3)
+
+
+class MedicationExternalInfoTests(SimpleTestCase):
+    """Tests for fetch_external_info method with success and failure paths."""
+
+    def setUp(self):
+        """Build an unsaved medication; the service call is mocked."""
+        self.base_med = MedicationFactory.build(name="Aspirin")
 
     @patch("medtrackerapp.models.DrugInfoService.get_drug_info")
     def test_fetch_external_info_success(self, mock_get_info):
@@ -152,16 +155,15 @@ class MedicationExternalInfoTests(TestCase):
 class DoseLogModelTests(TestCase):
     """Tests for DoseLog including positive and negative paths."""
 
-    def setUp(self):
-        """Set up a base medication for generic tests."""
-        self.base_med = Medication.objects.create(
-            name="Aspirin", dosage_mg=100, prescribed_per_day=2
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a base medication shared by every test in the class."""
+        cls.base_med = MedicationFactory(name="Aspirin")
 
     def test_str_representation(self):
         """__str__ returns formatted string with medication name and status."""
         taken_at = timezone.now()
-        log = DoseLog.objects.create(
+        log = DoseLogFactory(
             medication=self.base_med, taken_at=taken_at, was_taken=True
         )
 
@@ -170,19 +172,40 @@ class DoseLogModelTests(TestCase):
 
     def test_ordering_descending(self):
         """Meta.ordering ensures newest logs come first."""
-
-        t1 = timezone.now() - timedelta(hours=5)
-        t2 = timezone.now()
-
-        log_old = DoseLog.objects.create(medication=self.base_med, taken_at=t1)
-        log_new = DoseLog.objects.create(medication=self.base_med, taken_at=t2)
+        anchor = timezone.now()
+        log_old, log_new = DoseLog.objects.bulk_create(
+            [
+                DoseLogFactory.build(
+                    medication=self.base_med, taken_at=anchor - timedelta(hours=5)
+                ),
+                DoseLogFactory.build(medication=self.base_med, taken_at=anchor),
+            ]
+        )
 
         logs = list(DoseLog.objects.all())
         self.assertEqual(logs[0], log_new)
         self.assertEqual(logs[1], log_old)
 
+    def test_taken_between_is_inclusive_of_whole_days(self):
+        """taken_between covers start 00:00 through the end of end_date."""
+        day = date(2024, 5, 1)
+        midnight = timezone.make_aware(datetime.combine(day, time.min))
+        inside_first, inside_last, _after = DoseLog.objects.bulk_create(
+            DoseLogFactory.build(medication=self.base_med, taken_at=t)
+            for t in (
+                midnight,
+                midnight + timedelta(days=2) - timedelta(microseconds=1),
+                midnight + timedelta(days=2),
+            )
+        )
+
+        logs = DoseLog.objects.taken_between(day, day + timedelta(days=1))
+
+        self.assertCountEqual(logs, [inside_first, inside_last])
+
     def test_doselog_missing_medication_raises(self):
         """DoseLog must have a medication FK."""
         taken_at = timezone.now()
-        with self.assertRaises(IntegrityError):
+        with self.assertRaises(IntegrityError), transaction.atomic():
             DoseLog.objects.create(medication=None, taken_at=taken_at)
+        self.assertFalse(DoseLog.objects.exists())
@@ -1,18 +1,24 @@
+from unittest import skipUnless
+from django.core.cache import cache
+from django.db import connection
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
-from medtrackerapp.models import Medication
 from medtrackerapp.models import Note
+from medtrackerapp.tests.factories import MedicationFactory, NoteFactory
 
 
 class NoteViewTests(APITestCase):
     """Tests for /api/notes/ endpoint."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.med = MedicationFactory(name="Aspirin")
+        cls.list_url = reverse("note-list")
+
     def setUp(self):
-        self.med = Medication.objects.create(
-            name="Aspirin", dosage_mg=100, prescribed_per_day=2
-        )
-        self.list_url = reverse("note-list")
+        # Cached lists outlive the per-test rollback, which fires no signals.
+        cache.clear()
 
     def test_create_note(self):
         """Creating a note with valid data succeeds."""
@@ -23,14 +29,58 @@ class NoteViewTests(APITestCase):
 
     def test_list_notes(self):
         """Listing notes returns all existing notes."""
-        Note.objects.create(medication=self.med, text="List me")
+        NoteFactory(medication=self.med, text="List me")
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
 
+    def test_list_notes_query_count_is_constant(self):
+        """Listing notes of many medications runs a single query (no N+1)."""
+        Note.objects.bulk_create(
+            NoteFactory.build(medication=med)
+            for med in MedicationFactory.create_batch(20)
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 20)
+
+    def test_list_notes_cache_invalidated_on_changes(self):
+        """Creating a note or renaming its medication refreshes the cache."""
+        search_url = f"{self.list_url}?search=Aspirin"
+        self.assertEqual(len(self.client.get(search_url).data), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NoteFactory(medication=self.med)
+        self.assertEqual(len(self.client.get(search_url).data), 1)
+
+        self.med.name = "Paracetamol"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.med.save()
+        self.assertEqual(len(self.client.get(search_url).data), 0)
+
+    def test_list_notes_cache_keyed_on_search_terms(self):
+        """Only the normalized search terms select the cached entry."""
+        NoteFactory(medication=self.med)
+        self.client.get(self.list_url, {"search": "Aspirin"})
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, {"search": " aspirin ", "x": "1"})
+        self.assertEqual(len(response.data), 1)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, {"search": "Ibuprofen"})
+        self.assertEqual(len(response.data), 0)
+
+    @skipUnless(connection.vendor == "postgresql", "pg_trgm ranking")
+    def test_search_ranked_by_similarity(self):
+        """Search results put the closest medication name first."""
+        forte = NoteFactory(medication=MedicationFactory(name="Aspirin Forte 500"))
+        plain = NoteFactory(medication=self.med)
+        response = self.client.get(self.list_url, {"search": "aspirin"})
+        self.assertEqual([note["id"] for note in response.data], [plain.id, forte.id])
+
     def test_retrieve_note(self):
         """Retrieving a specific note by ID works correctly."""
-        note = Note.objects.create(medication=self.med, text="Retrieve me")
+        note = NoteFactory(medication=self.med, text="Retrieve me")
         url = reverse("note-detail", args=[note.id])
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -38,7 +88,7 @@ class NoteViewTests(APITestCase):
 
     def test_delete_note(self):
         """Deleting a note removes it from the database."""
-        note = Note.objects.create(medication=self.med, text="Delete me")
+        note = NoteFactory(medication=self.med, text="Delete me")
         url = reverse("note-detail", args=[note.id])
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -46,7 +96,7 @@ class NoteViewTests(APITestCase):
 
     def test_update_not_allowed(self):
         """Updating a note is not allowed and returns 405."""
-        note = Note.objects.create(medication=self.med, text="Don't update me")
+        note = NoteFactory(medication=self.med, text="Don't update me")
         url = reverse("note-detail", args=[note.id])
         response = self.client.put(url, {"text": "Update attempt"})
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
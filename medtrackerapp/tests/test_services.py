@@ -1,29 +1,38 @@
 from unittest.mock import patch, MagicMock
-from rest_framework.test import APITestCase
+from django.core.cache import cache
+from django.test import SimpleTestCase
 from medtrackerapp.services import DrugInfoService
 
 
-class DrugInfoServiceTests(APITestCase):
+@patch("medtrackerapp.services._session.get")
+class DrugInfoServiceTests(SimpleTestCase):
     """Tests for external API integration via DrugInfoService, using mocks."""
 
-    @patch("medtrackerapp.services.requests.get")
+    _SUCCESS_JSON = {
+        "results": [
+            {
+                "openfda": {
+                    "generic_name": ["ibuprofen"],
+                    "manufacturer_name": ["Bayer"],
+                },
+                "warnings": ["Do not exceed 6 pills per day"],
+                "purpose": ["Pain relief"],
+            }
+        ]
+    }
+
+    def setUp(self):
+        cache.clear()
+
+    def _mock_response(self, status_code, json_data=None):
+        """Build a fake `requests` response with the given status and payload."""
+        response = MagicMock(status_code=status_code)
+        response.json.return_value = json_data
+        return response
+
     def test_get_drug_info_success(self, mock_get):
         """Mock a successful API response and verify parsed output."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [
-                {
-                    "openfda": {
-                        "generic_name": ["ibuprofen"],
-                        "manufacturer_name": ["Bayer"],
-                    },
-                    "warnings": ["Do not exceed 6 pills per day"],
-                    "purpose": ["Pain relief"],
-                }
-            ]
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = self._mock_response(200, self._SUCCESS_JSON)
 
         data = DrugInfoService.get_drug_info("ibuprofen")
 
@@ -31,28 +40,41 @@ class DrugInfoServiceTests(APITestCase):
         self.assertEqual(data["manufacturer"], "Bayer")
         self.assertIn("Pain relief", data["purpose"])
 
-    @patch("medtrackerapp.services.requests.get")
     def test_get_drug_info_api_error(self, mock_get):
         """Mock non-200 status codes and ensure ValueError is raised."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_get.return_value = mock_response
+        mock_get.return_value = self._mock_response(500)
 
         with self.assertRaises(ValueError):
             DrugInfoService.get_drug_info("ibuprofen")
 
-    @patch("medtrackerapp.services.requests.get")
     def test_get_drug_info_no_results(self, mock_get):
         """Mock an empty results list and ensure ValueError is raised."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"results": []}
-        mock_get.return_value = mock_response
+        mock_get.return_value = self._mock_response(200, {"results": []})
 
         with self.assertRaises(ValueError):
             DrugInfoService.get_drug_info("ibuprofen")
 
-    def test_get_drug_info_missing_name_raises(self):
+    def test_get_drug_info_missing_name_raises(self, mock_get):
         """Empty drug_name should raise ValueError."""
         with self.assertRaises(ValueError):
             DrugInfoService.get_drug_info("")
+        mock_get.assert_not_called()
+
+    def test_get_drug_info_caches_second_call(self, mock_get):
+        """Repeated lookups of the same drug hit the API only once."""
+        mock_get.return_value = self._mock_response(200, self._SUCCESS_JSON)
+
+        first = DrugInfoService.get_drug_info("ibuprofen")
+        second = DrugInfoService.get_drug_info("Ibuprofen")
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_get_drug_info_does_not_cache_errors(self, mock_get):
+        """A failed lookup is retried on the next call."""
+        mock_get.return_value = self._mock_response(500)
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                DrugInfoService.get_drug_info("ibuprofen")
+        self.assertEqual(mock_get.call_count, 2)
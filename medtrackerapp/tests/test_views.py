@@ -1,29 +1,101 @@
+import json
 from django.utils import timezone
 from datetime import timedelta
 from unittest.mock import patch
+from django.core.cache import cache
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework.serializers import ModelSerializer
+from django.test import override_settings
 from django.urls import reverse
 
 from medtrackerapp.models import Medication, DoseLog
+from medtrackerapp.serializers import DoseLogSerializer, MedicationSerializer
+from medtrackerapp.tests.factories import DoseLogFactory, MedicationFactory
 
 
 class MedicationViewTests(APITestCase):
     """Tests for Medication CRUD API endpoints."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.med = MedicationFactory(name="Aspirin")
+        cls.list_url = reverse("medication-list")
+        cls.detail_url = reverse("medication-detail", args=[cls.med.id])
+
     def setUp(self):
-        self.med = Medication.objects.create(
-            name="Aspirin", dosage_mg=100, prescribed_per_day=2
-        )
-        self.list_url = reverse("medication-list")
+        # Cached lists outlive the per-test rollback, which fires no signals.
+        cache.clear()
 
     def test_list_medications_valid_data(self):
         """List endpoint returns existing medications."""
-        response = self.client.get(self.list_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["name"], "Aspirin")
 
+    def test_list_medications_adherence_in_single_query(self):
+        """Adherence for many medications is computed in the list query."""
+        DoseLog.objects.bulk_create(
+            DoseLogFactory.build(medication=med, was_taken=was_taken)
+            for med in MedicationFactory.create_batch(10)
+            for was_taken in (True, True, False, True)
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        adherence = {item["name"]: item["adherence"] for item in response.data}
+        self.assertEqual(len(adherence), 11)
+        self.assertEqual(adherence.pop("Aspirin"), 0.0)
+        self.assertEqual(set(adherence.values()), {75.0})
+
+    def test_list_medications_served_from_cache(self):
+        """A repeated list request is answered without touching the DB."""
+        self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    def test_list_medications_cache_ignores_query_string(self):
+        """Unrelated query parameters share the cached list."""
+        self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, {"junk": "1"})
+        self.assertEqual(len(response.data), 1)
+
+    @override_settings(CACHE_API_RESPONSES=False)
+    def test_list_medications_not_cached_without_shared_cache(self):
+        """Without a shared cache backend every list hits the database."""
+        self.client.get(self.list_url)
+        with self.assertNumQueries(1):
+            self.client.get(self.list_url)
+
+    def test_list_medications_cache_invalidated_on_changes(self):
+        """Saving medications or dose logs refreshes the cached list."""
+        self.client.get(self.list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MedicationFactory(name="Ibuprofen")
+        response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DoseLogFactory(medication=self.med, was_taken=True)
+        response = self.client.get(self.list_url)
+        adherence = {item["name"]: item["adherence"] for item in response.data}
+        self.assertEqual(adherence["Aspirin"], 100.0)
+
+    def test_list_medications_cache_invalidated_after_commit(self):
+        """The cached list is only invalidated once the write commits."""
+        self.client.get(self.list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MedicationFactory(name="Ibuprofen")
+            self.assertEqual(len(self.client.get(self.list_url).data), 1)
+        self.assertEqual(len(self.client.get(self.list_url).data), 2)
+
     def test_create_medication_valid(self):
         """Create a medication with valid data."""
         data = {"name": "Ibuprofen", "dosage_mg": 200, "prescribed_per_day": 3}
@@ -39,11 +111,18 @@ class MedicationViewTests(APITestCase):
 
     def test_retrieve_medication(self):
         """Retrieve a specific medication."""
-        url = reverse("medication-detail", args=[self.med.id])
-        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["name"], "Aspirin")
 
+    def test_retrieve_medication_matches_generic_representation(self):
+        """The hand-written representation matches ModelSerializer's output."""
+        DoseLogFactory(medication=self.med, was_taken=False)
+        expected = ModelSerializer.to_representation(MedicationSerializer(), self.med)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data, dict(expected))
+
     def test_retrieve_invalid_medication(self):
         """Retrieving non-existing medication returns 404."""
         url = reverse("medication-detail", args=[999])
@@ -52,16 +131,14 @@ class MedicationViewTests(APITestCase):
 
     def test_update_medication(self):
         """Update a medication with valid data."""
-        url = reverse("medication-detail", args=[self.med.id])
         data = {"name": "Updated", "dosage_mg": 150, "prescribed_per_day": 1}
-        response = self.client.put(url, data)
+        response = self.client.put(self.detail_url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["name"], "Updated")
 
     def test_delete_medication(self):
         """Deleting a medication removes it."""
-        url = reverse("medication-detail", args=[self.med.id])
-        response = self.client.delete(url)
+        response = self.client.delete(self.detail_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Medication.objects.count(), 0)
 
@@ -69,11 +146,13 @@ class MedicationViewTests(APITestCase):
 class MedicationExternalInfoViewTests(APITestCase):
     """Tests for /medications/<id>/info/ endpoint using mocked service calls."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.med = MedicationFactory(name="Aspirin")
+        cls.url = reverse("medication-get-external-info", args=[cls.med.id])
+
     def setUp(self):
-        self.med = Medication.objects.create(
-            name="Aspirin", dosage_mg=100, prescribed_per_day=2
-        )
-        self.url = reverse("medication-get-external-info", args=[self.med.id])
+        cache.clear()
 
     @patch("medtrackerapp.models.Medication.fetch_external_info")
     def test_view_external_info_success(self, mock_fetch):
@@ -85,6 +164,25 @@ class MedicationExternalInfoViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["manufacturer"], "Pfizer")
 
+    @patch("medtrackerapp.services.DrugInfoService._fetch_drug_info")
+    def test_view_external_info_not_modified(self, mock_fetch):
+        """A matching If-None-Match header short-circuits to 304."""
+        mock_fetch.return_value = {"name": "Aspirin", "manufacturer": "Pfizer"}
+
+        etag = self.client.get(self.url)["ETag"]
+        with patch("medtrackerapp.models.Medication.fetch_external_info") as fetch:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        fetch.assert_not_called()
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        mock_fetch.return_value = {"name": "Aspirin", "manufacturer": "Bayer"}
+        cache.clear()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
     @patch("medtrackerapp.models.Medication.fetch_external_info")
     def test_view_external_api_error(self, mock_fetch):
         """Mock external API error and ensure view returns 502."""
@@ -99,20 +197,29 @@ class MedicationExternalInfoViewTests(APITestCase):
 class DoseLogViewTests(APITestCase):
     """Tests for DoseLog CRUD and filter endpoints."""
 
-    def setUp(self):
-        self.med = Medication.objects.create(
-            name="Aspirin", dosage_mg=100, prescribed_per_day=2
-        )
+    @classmethod
+    def setUpTestData(cls):
+        cls.med = MedicationFactory(name="Aspirin")
         now = timezone.now()
 
-        self.log1 = DoseLog.objects.create(
-            medication=self.med, taken_at=now - timedelta(days=2), was_taken=True
-        )
-        self.log2 = DoseLog.objects.create(
-            medication=self.med, taken_at=now - timedelta(days=1), was_taken=False
+        cls.log1, cls.log2 = DoseLog.objects.bulk_create(
+            [
+                DoseLog(
+                    medication=cls.med,
+                    taken_at=now - timedelta(days=2),
+                    was_taken=True,
+                ),
+                DoseLog(
+                    medication=cls.med,
+                    taken_at=now - timedelta(days=1),
+                    was_taken=False,
+                ),
+            ]
         )
 
-        self.list_url = reverse("doselog-list")
+        cls.list_url = reverse("doselog-list")
+        cls.detail_url = reverse("doselog-detail", args=[cls.log1.id])
+        cls.filter_url = reverse("doselog-filter-by-date")
 
     def test_list_logs(self):
         """List endpoint returns dose logs."""
@@ -120,6 +227,17 @@ class DoseLogViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)
 
+    def test_list_logs_query_count_is_constant(self):
+        """Listing logs of many medications runs a single query (no N+1)."""
+        DoseLog.objects.bulk_create(
+            DoseLogFactory.build(medication=med)
+            for med in MedicationFactory.create_batch(20)
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 22)
+
     def test_create_log_valid(self):
         """Create a dose log with valid data."""
         data = {
@@ -140,13 +258,68 @@ class DoseLogViewTests(APITestCase):
         response = self.client.post(self.list_url, data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_bulk_create_logs(self):
+        """Bulk endpoint creates every submitted log."""
+        data = [
+            {
+                "medication": self.med.id,
+                "taken_at": (timezone.now() - timedelta(hours=hours)).isoformat(),
+                "was_taken": True,
+            }
+            for hours in range(3)
+        ]
+        url = reverse("doselog-bulk")
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertTrue(all(log["id"] for log in response.data))
+        self.assertEqual(DoseLog.objects.count(), 5)
+
+    def test_bulk_create_logs_invalid(self):
+        """One invalid entry rejects the whole batch."""
+        data = [
+            {"medication": self.med.id, "taken_at": timezone.now().isoformat()},
+            {"medication": 999, "taken_at": timezone.now().isoformat()},
+        ]
+        response = self.client.post(reverse("doselog-bulk"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(list(errors), ["1"])
+        self.assertIn("medication", errors["1"])
+        self.assertEqual(DoseLog.objects.count(), 2)
+
+    def test_bulk_create_logs_too_many(self):
+        """Batches over the size limit are rejected before validating rows."""
+        entry = {"medication": self.med.id, "taken_at": timezone.now().isoformat()}
+        data = [entry] * 501
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse("doselog-bulk"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(DoseLog.objects.count(), 2)
+
+    def test_bulk_create_logs_refreshes_medication_list(self):
+        """Bulk-created logs are reflected in the cached adherence."""
+        cache.clear()
+        list_url = reverse("medication-list")
+        self.assertEqual(self.client.get(list_url).data[0]["adherence"], 50.0)
+
+        data = [{"medication": self.med.id, "taken_at": timezone.now().isoformat()}] * 2
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("doselog-bulk"), data, format="json")
+        self.assertEqual(self.client.get(list_url).data[0]["adherence"], 75.0)
+
     def test_retrieve_log(self):
         """Retrieve a specific dose log."""
-        url = reverse("doselog-detail", args=[self.log1.id])
-        response = self.client.get(url)
+        response = self.client.get(self.detail_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["id"], self.log1.id)
 
+    def test_retrieve_log_matches_generic_representation(self):
+        """The hand-written representation matches ModelSerializer's output."""
+        expected = ModelSerializer.to_representation(DoseLogSerializer(), self.log1)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data, dict(expected))
+
     def test_retrieve_invalid_log(self):
         """Retrieving non-existing log returns 404."""
         url = reverse("doselog-detail", args=[999])
@@ -155,16 +328,14 @@ class DoseLogViewTests(APITestCase):
 
     def test_delete_log(self):
         """Deleting a dose log removes it."""
-        url = reverse("doselog-detail", args=[self.log1.id])
-        response = self.client.delete(url)
+        response = self.client.delete(self.detail_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(DoseLog.objects.count(), 1)
 
     def test_filter_logs_valid_range(self):
         """Filtering logs by valid start/end dates returns correct results."""
-        url = reverse("doselog-filter-by-date")
         response = self.client.get(
-            url,
+            self.filter_url,
             {
                 "start": (timezone.now() - timedelta(days=3)).date().isoformat(),
                 "end": timezone.now().date().isoformat(),
@@ -173,14 +344,144 @@ class DoseLogViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)
 
+    def test_filter_logs_paginated(self):
+        """page_size switches the filter endpoint to cursor pagination."""
+        params = {
+            "start": (timezone.now() - timedelta(days=3)).date().isoformat(),
+            "end": timezone.now().date().isoformat(),
+            "page_size": 1,
+        }
+        response = self.client.get(self.filter_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [log["id"] for log in response.data["results"]], [self.log1.id]
+        )
+        self.assertIsNone(response.data["previous"])
+        self.assertFalse(response.has_header("ETag"))
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [log["id"] for log in response.data["results"]], [self.log2.id]
+        )
+
+    def test_filter_logs_paginated_with_shared_timestamps(self):
+        """Logs sharing a taken_at are each paged exactly once."""
+        taken_at = timezone.now() - timedelta(hours=1)
+        shared = DoseLog.objects.bulk_create(
+            DoseLogFactory.build(medication=self.med, taken_at=taken_at)
+            for _ in range(4)
+        )
+        params = {
+            "start": (timezone.now() - timedelta(days=3)).date().isoformat(),
+            "end": timezone.now().date().isoformat(),
+            "page_size": 1,
+        }
+        seen = []
+        response = self.client.get(self.filter_url, params)
+        while True:
+            seen += [log["id"] for log in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(
+            seen, [self.log1.id, self.log2.id, *(log.id for log in shared)]
+        )
+
+    def test_filter_logs_compact_matches_serializer(self):
+        """compact=true renders the same JSON without the serializer."""
+        params = {
+            "start": (timezone.now() - timedelta(days=3)).date().isoformat(),
+            "end": timezone.now().date().isoformat(),
+        }
+        full = self.client.get(self.filter_url, params)
+        compact = self.client.get(self.filter_url, {**params, "compact": "true"})
+
+        self.assertEqual(compact.status_code, status.HTTP_200_OK)
+        self.assertEqual(compact.json(), full.json())
+
+        paged = self.client.get(
+            self.filter_url, {**params, "compact": "true", "page_size": 1}
+        )
+        self.assertEqual(paged.json()["results"], full.json()[:1])
+        paged = self.client.get(paged.data["next"])
+        self.assertEqual(paged.json()["results"], full.json()[1:])
+
+    def test_filter_logs_long_range_streamed(self):
+        """Long unpaginated ranges are streamed with the same JSON."""
+        params = {
+            "start": (timezone.now() - timedelta(days=60)).date().isoformat(),
+            "end": timezone.now().date().isoformat(),
+        }
+        response = self.client.get(self.filter_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.has_header("ETag"))
+
+        paged = self.client.get(self.filter_url, {**params, "page_size": 500})
+        self.assertFalse(paged.streaming)
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content)),
+            paged.json()["results"],
+        )
+
+    def test_filter_logs_not_modified(self):
+        """A matching If-None-Match returns 304 after a single aggregate."""
+        params = {
+            "start": (timezone.now() - timedelta(days=3)).date().isoformat(),
+            "end": timezone.now().date().isoformat(),
+        }
+        etag = self.client.get(self.filter_url, params)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.filter_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other = MedicationFactory()
+        first, second = self.log1.taken_at.isoformat(), self.log2.taken_at.isoformat()
+        edits = [
+            [(self.log1, {"was_taken": False})],
+            [(self.log1, {"medication": other.id})],
+            [
+                (
+                    self.log1,
+                    {"taken_at": (self.log1.taken_at + timedelta(hours=1)).isoformat()},
+                )
+            ],
+            # Swapping two timestamps keeps every per-column total intact.
+            [(self.log1, {"taken_at": second}), (self.log2, {"taken_at": first})],
+        ]
+        for edit in edits:
+            with self.subTest(edit=edit):
+                for log, data in edit:
+                    self.client.patch(
+                        reverse("doselog-detail", args=[log.id]), data, format="json"
+                    )
+                response = self.client.get(
+                    self.filter_url, params, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotEqual(response["ETag"], etag)
+                etag = response["ETag"]
+
     def test_filter_logs_missing_params(self):
         """Filter endpoint returns 400 if end date is missing or invalid."""
-        url = reverse("doselog-filter-by-date")
-        response = self.client.get(url, {"start": "2020-01-01", "end": ""})
+        response = self.client.get(self.filter_url, {"start": "2020-01-01", "end": ""})
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_filter_logs_invalid_dates(self):
         """Filter endpoint returns 400 for invalid date format."""
-        url = reverse("doselog-filter-by-date")
-        response = self.client.get(url, {"start": "nope", "end": "also_nope"})
+        response = self.client.get(
+            self.filter_url, {"start": "nope", "end": "also_nope"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(
+            self.filter_url, {"start": "2025-02-01", "end": "2025-02-30"}
+        )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_logs_unpadded_dates(self):
+        """Dates without zero padding are accepted."""
+        response = self.client.get(
+            self.filter_url, {"start": "2025-2-1", "end": "2025-2-7"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1,15 +1,66 @@
+import hashlib
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.db.models import Count, Max, Q
 from django.utils.dateparse import parse_date
+from django.utils.http import parse_etags, quote_etag
+from .caching import (
+    EXPECTED_DOSES_CACHE_TIMEOUT,
+    LIST_CACHE_TIMEOUT,
+    bump_cache_version,
+    response_cache_enabled,
+    versioned_key,
+)
+from .filters import TrigramSearchFilter
 from .models import Medication, DoseLog
+from .pagination import DoseLogCursorPagination
 from .serializers import MedicationSerializer, DoseLogSerializer
 from .models import Note
 from .serializers import NoteSerializer
-from rest_framework.filters import SearchFilter
 
 
-class MedicationViewSet(viewsets.ModelViewSet):
+class CachedListMixin:
+    """
+    Cache the `list` response of a viewset.
+
+    Entries are keyed on the version of `cache_group`, which the model
+    signals in `signals.py` bump once a write to a row the list depends
+    on commits. Caching is only enabled on a cache backend shared by all
+    workers (see `response_cache_enabled`), where that bump reaches every
+    one of them.
+    """
+
+    cache_group = None
+
+    def list_cache_key_parts(self, request):
+        """
+        Return the request values the list depends on.
+
+        Only these go into the cache key, so unrelated query parameters
+        share one entry instead of each storing a copy of the list.
+        """
+        return ()
+
+    def list(self, request, *args, **kwargs):
+        if not response_cache_enabled():
+            return super().list(request, *args, **kwargs)
+
+        key = versioned_key(
+            self.cache_group, "list", *self.list_cache_key_parts(request)
+        )
+        data = cache.get(key)
+        if data is None:
+            data = list(super().list(request, *args, **kwargs).data)
+            cache.set(key, data, LIST_CACHE_TIMEOUT)
+        return Response(data)
+
+
+class MedicationViewSet(CachedListMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and managing medications.
 
@@ -24,10 +75,35 @@ class MedicationViewSet(viewsets.ModelViewSet):
         - PUT/PATCH /medications/{id}/ — update a medication
         - DELETE /medications/{id}/ — delete a medication
         - GET /medications/{id}/info/ — fetch external drug info from OpenFDA
+        - GET /medications/expected-doses-bulk/?days=N — expected doses of
+          every medication
     """
 
     queryset = Medication.objects.all()
     serializer_class = MedicationSerializer
+    cache_group = "medications"
+
+    def get_queryset(self):
+        """
+        Return the medications, with dose counts for serialized actions.
+
+        `MedicationSerializer.adherence` needs the total and taken dose
+        counts of every medication. Annotating them here computes the
+        counts in the same query, so listing N medications costs one
+        query instead of N + 1. Actions that read only a couple of
+        columns select just those.
+        """
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve", "update", "partial_update"):
+            queryset = queryset.annotate(
+                total_doses=Count("doselog"),
+                taken_doses=Count("doselog", filter=Q(doselog__was_taken=True)),
+            )
+        elif self.action in ("expected_doses_view", "expected_doses_bulk"):
+            queryset = queryset.only("id", "prescribed_per_day")
+        elif self.action == "get_external_info":
+            queryset = queryset.only("id", "name")
+        return queryset
 
     @action(detail=True, methods=["get"], url_path="info")
     def get_external_info(self, request, pk=None):
@@ -35,7 +111,9 @@ class MedicationViewSet(viewsets.ModelViewSet):
         Retrieve external drug information from the OpenFDA API.
 
         Calls the `Medication.fetch_external_info()` method, which
-        delegates to the `DrugInfoService` for API access.
+        delegates to the `DrugInfoService` for API access. Successful
+        responses carry the ETag of the cached drug info; a request whose
+        `If-None-Match` matches it gets 304 without the info being loaded.
 
         Args:
             request (Request): The current HTTP request.
@@ -44,17 +122,38 @@ class MedicationViewSet(viewsets.ModelViewSet):
         Returns:
             Response:
                 - 200 OK: External API data returned successfully.
+                - 304 NOT MODIFIED: If the info matches the `If-None-Match` ETag.
                 - 502 BAD GATEWAY: If the external API request failed.
 
         Example:
             GET /medications/1/info/
         """
         medication = self.get_object()
+        etag = medication.external_info_etag()
+        if etag and etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
         data = medication.fetch_external_info()
 
         if isinstance(data, dict) and data.get("error"):
             return Response(data, status=status.HTTP_502_BAD_GATEWAY)
-        return Response(data)
+        response = Response(data)
+        etag = medication.external_info_etag()
+        if etag:
+            response["ETag"] = etag
+        return response
+
+    @staticmethod
+    def _days_param(request):
+        """Return the positive integer `days` query parameter, or None."""
+        days_param = request.query_params.get("days")
+        # Checked up front rather than by catching int()'s ValueError, which
+        # is the common path for malformed input. Nine digits is far beyond
+        # any meaningful number of days.
+        if not days_param or len(days_param) > 9 or not days_param.isdecimal():
+            return None
+        days = int(days_param)
+        return days if days > 0 else None
 
     @action(detail=True, methods=["get"], url_path="expected-doses")
     def expected_doses_view(self, request, pk=None):
@@ -76,32 +175,79 @@ class MedicationViewSet(viewsets.ModelViewSet):
                 - 400 BAD REQUEST: If the `days` parameter is missing, invalid, or if
                   the calculation raises a `ValueError`.
 
+        On a shared cache backend (see `response_cache_enabled`), results
+        are cached per medication and `days`, under the
+        "expected-doses" cache version that the Medication signals bump on
+        every save or delete, so a repeated request is answered without
+        touching the database. Dose logs do not affect the result and do
+        not invalidate it. A cache hit skips `get_object()` and therefore
+        `check_object_permissions()`; this viewset has no object-level
+        permissions, but adding any would require looking the medication
+        up before answering from the cache.
         """
-        medication = self.get_object()
+        days = self._days_param(request)
+        if days is None:
+            return Response(
+                {"error": "Invalid 'days' parameter"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        days_param = request.query_params.get("days")
+        cached = response_cache_enabled()
+        key = versioned_key("expected-doses", pk, days) if cached else None
+        data = cache.get(key) if cached else None
+        if data is None:
+            medication = self.get_object()
+            try:
+                doses = medication.expected_doses(days)
+            except ValueError as exc:
+                return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            data = {
+                "medication_id": medication.id,
+                "days": days,
+                "expected_doses": doses,
+            }
+            if cached:
+                cache.set(key, data, EXPECTED_DOSES_CACHE_TIMEOUT)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="expected-doses-bulk")
+    def expected_doses_bulk(self, request):
+        """
+        Retrieve the expected doses of every medication over a number of days.
 
-        try:
-            if days_param is None:
-                raise ValueError("Missing 'days' parameter")
-            days = int(days_param)
-            if days <= 0:
-                raise ValueError("'days' must be positive")
-        except (ValueError, TypeError):
+        Answers in a single query what would otherwise take one
+        `expected-doses` request per medication.
+
+        Query Parameters:
+            - days (int): Number of days, must be positive.
+
+        Returns:
+            Response:
+                - 200 OK: The number of days and a `results` list with the
+                  expected doses of each medication. `expected_doses` is
+                  null for medications without a valid schedule.
+                - 400 BAD REQUEST: If the `days` parameter is missing or invalid.
+
+        Example:
+            GET /medications/expected-doses-bulk/?days=7
+        """
+        days = self._days_param(request)
+        if days is None:
             return Response(
                 {"error": "Invalid 'days' parameter"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        try:
-            doses = medication.expected_doses(days)
-        except ValueError as exc:
-            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        results = []
+        for medication in self.get_queryset().order_by("id"):
+            try:
+                doses = medication.expected_doses(days)
+            except ValueError:
+                doses = None
+            results.append({"medication_id": medication.id, "expected_doses": doses})
 
-        return Response(
-            {"medication_id": medication.id, "days": days, "expected_doses": doses},
-            status=status.HTTP_200_OK,
-        )
+        return Response({"days": days, "results": results}, status=status.HTTP_200_OK)
 
 
 class DoseLogViewSet(viewsets.ModelViewSet):
@@ -120,12 +266,109 @@ class DoseLogViewSet(viewsets.ModelViewSet):
         - DELETE /logs/{id}/ — delete a dose log
         - GET /logs/filter/?start=YYYY-MM-DD&end=YYYY-MM-DD —
           filter logs within a date range
+        - POST /logs/bulk/ — create many dose logs at once
     """
 
     queryset = DoseLog.objects.all()
     serializer_class = DoseLogSerializer
 
-    @action(detail=False, methods=["get"], url_path="filter")
+    # Columns of the `compact` and streamed outputs, matching the serializer.
+    compact_fields = ("id", "medication", "taken_at", "was_taken")
+    # Unpaginated date ranges at least this long are streamed.
+    stream_threshold_days = 31
+    # Most dose logs accepted by one bulk create request.
+    bulk_max_size = 500
+
+    @staticmethod
+    def _date_param(request, name):
+        """
+        Return the query parameter `name` as a date, or None if invalid.
+
+        `parse_date` already tries the C-implemented `date.fromisoformat`
+        first and falls back to a regex that also accepts unpadded dates
+        such as 2025-2-1. It raises ValueError for well-formed but
+        impossible dates such as 2025-02-30, which are invalid here too.
+        """
+        value = request.query_params.get(name)
+        try:
+            return parse_date(value) if value else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _date_range_etag(request, logs):
+        """
+        Fingerprint the logs of a date range with a single aggregate query.
+
+        Any save stamps `DoseLog.updated_at`, so an edit of any log in
+        the range (or one moved into it) raises the latest `updated_at`.
+        Removing logs lowers the count, and a log created in their place
+        raises the highest id. All three columns are in the
+        `dlog_taken_cov` index, so PostgreSQL computes them without
+        reading the table. `QuerySet.update()` bypasses `auto_now` and
+        must set `updated_at` itself. The request path covers the query
+        parameters that change the representation.
+        """
+        fingerprint = logs.aggregate(
+            count=Count("id"),
+            last_id=Max("id"),
+            last_updated_at=Max("updated_at"),
+        )
+        parts = [request.get_full_path(), *fingerprint.values()]
+        digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+        return quote_etag(digest)
+
+    @staticmethod
+    def _stream_json(rows):
+        """Encode `rows` as a JSON array, one row at a time."""
+        encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+        yield "["
+        for i, row in enumerate(rows):
+            yield ("," if i else "") + encoder.encode(row)
+        yield "]"
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Create many dose logs in one request.
+
+        Accepts a JSON list of dose logs in the same format as
+        `POST /logs/`, for clients syncing doses recorded offline. The
+        logs are validated together and written with batched multi-row
+        INSERTs; if any entry is invalid, none are created. At most
+        `bulk_max_size` logs are accepted per request.
+
+        Returns:
+            Response:
+                - 201 CREATED: The created dose logs.
+                - 400 BAD REQUEST: Validation errors, keyed by the index of each
+                  invalid log, or a single error if more than `bulk_max_size`
+                  logs were sent.
+
+        Example:
+            POST /logs/bulk/
+        """
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=self.bulk_max_size
+        )
+        serializer.is_valid(raise_exception=True)
+        logs = DoseLog.objects.bulk_create(
+            [DoseLog(**item) for item in serializer.validated_data],
+            batch_size=self.bulk_max_size,
+        )
+        # bulk_create sends no post_save signals, so invalidate by hand;
+        # the bump itself waits for the transaction to commit.
+        bump_cache_version("medications")
+        return Response(
+            self.get_serializer(logs, many=True).data, status=status.HTTP_201_CREATED
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="filter",
+        pagination_class=DoseLogCursorPagination,
+    )
     def filter_by_date(self, request):
         """
         Retrieve all dose logs within a given date range.
@@ -133,17 +376,35 @@ class DoseLogViewSet(viewsets.ModelViewSet):
         Query Parameters:
             - start (YYYY-MM-DD): Start date of the range (inclusive).
             - end (YYYY-MM-DD): End date of the range (inclusive).
+            - page_size (int, optional): Paginate the results with cursor
+              pagination, returning at most this many logs per page.
+            - compact (true/1, optional): Return rows read directly with
+              `QuerySet.values()`, skipping the serializer. Same keys as
+              the regular output.
+
+        Unpaginated ranges of `stream_threshold_days` days or more are
+        streamed from a chunked database cursor in the compact format,
+        so memory use stays flat however many logs match.
+
+        Other unpaginated responses carry an ETag derived from an
+        aggregate over the range; a request whose `If-None-Match` matches
+        gets 304 Not Modified before any log is loaded or serialized.
+        Pages and streams have no ETag, so they never pay for an extra
+        pass over the whole range.
 
         Returns:
             Response:
-                - 200 OK: A list of dose logs between the two dates.
+                - 200 OK: A list of dose logs between the two dates, or a
+                  page of them with `next`/`previous` cursor links when
+                  `page_size` is given.
+                - 304 NOT MODIFIED: If the logs match the `If-None-Match` ETag.
                 - 400 BAD REQUEST: If start or end parameters are missing or invalid.
 
         Example:
             GET /logs/filter/?start=2025-11-01&end=2025-11-07
         """
-        start = parse_date(request.query_params.get("start"))
-        end = parse_date(request.query_params.get("end"))
+        start = self._date_param(request, "start")
+        end = self._date_param(request, "end")
 
         if not start or not end:
             return Response(
@@ -153,17 +414,34 @@ class DoseLogViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        logs = (
-            self.get_queryset()
-            .filter(taken_at__date__gte=start, taken_at__date__lte=end)
-            .order_by("taken_at")
-        )
+        logs = self.get_queryset().taken_between(start, end).order_by("taken_at", "id")
+
+        compact = request.query_params.get("compact", "").lower() in ("1", "true")
+        if compact:
+            logs = logs.values(*self.compact_fields)
+
+        page = self.paginate_queryset(logs)
+        if page is not None:
+            data = list(page) if compact else self.get_serializer(page, many=True).data
+            return self.get_paginated_response(data)
 
-        serializer = self.get_serializer(logs, many=True)
-        return Response(serializer.data)
+        if (end - start).days >= self.stream_threshold_days:
+            rows = logs.values(*self.compact_fields).iterator(chunk_size=2000)
+            return StreamingHttpResponse(
+                self._stream_json(rows), content_type="application/json"
+            )
+
+        etag = self._date_range_etag(request, logs)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
+        data = list(logs) if compact else self.get_serializer(logs, many=True).data
+        response = Response(data)
+        response["ETag"] = etag
+        return response
 
-class NoteViewSet(viewsets.ModelViewSet):
+
+class NoteViewSet(CachedListMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing notes.
 
@@ -180,8 +458,15 @@ class NoteViewSet(viewsets.ModelViewSet):
 
     queryset = Note.objects.all()
     serializer_class = NoteSerializer
+    cache_group = "notes"
 
-    filter_backends = (SearchFilter,)
+    filter_backends = (TrigramSearchFilter,)
     search_fields = ["medication__name"]
 
     http_method_names = ["get", "post", "delete", "head", "options"]
+
+    def list_cache_key_parts(self, request):
+        # The search terms are the only input of the list; matching and
+        # trigram ranking are both case-insensitive.
+        terms = TrigramSearchFilter().get_search_terms(request)
+        return (" ".join(term.lower() for term in terms),)